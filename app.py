@@ -1,8 +1,36 @@
 import streamlit as st
 import google.generativeai as genai
+import orjson
+import fastjsonschema
+import asyncio
+import atexit
+import concurrent.futures
+import hashlib
+import shutil
+import subprocess
 import tempfile
+import time
 import os
 
+try:
+    import vad
+except ImportError:  # numpy / soundfile / webrtcvad not installed
+    vad = None
+
+# gRPC multiplexes the upload, the ACTIVE-state polls and the generate call
+# over one HTTP/2 connection instead of separate HTTPS sessions, saving a
+# couple of round trips per request. Fall back to REST where grpc is absent.
+try:
+    import grpc  # noqa: F401
+    _TRANSPORT = "grpc"
+except ImportError:
+    _TRANSPORT = "rest"
+
+# Shared pool for work that can overlap the main script run (uploads, cleanup).
+_io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+# Let pending cleanup (remote deletes, temp-file removal) finish on exit.
+atexit.register(_io_pool.shutdown, wait=True)
+
 # 1. Page Configuration & Layout
 st.set_page_config(page_title="Pro Meeting Transcriber", layout="wide", page_icon="🎙️")
 
@@ -24,6 +52,13 @@ with st.sidebar:
         help="Select the model for processing your audio."
     )
     
+    output_mode = st.radio(
+        "Output style",
+        options=["Basic", "JSON", "Dashboard", "Markdown"],
+        index=3,
+        help="How the summary and transcript are presented."
+    )
+
     st.markdown("---")
     st.markdown("### About")
     st.markdown("Generates human-readable, formatted meeting notes and translated transcripts from mixed-language audio.")
@@ -33,6 +68,350 @@ st.title("🎙️ LalScribe")
 st.markdown("Multilingual Meeting Transcriber & Summarizer - Upload your meeting recording to generate a structured summary and transcript.")
 
 audio_file = st.file_uploader("Upload Audio File", type=["mp3", "wav", "m4a", "ogg"])
+if audio_file and audio_file.size > 200 * (1 << 20):
+    st.warning("Large file — the browser upload itself can take a while on remote deployments.")
+
+
+def filter_silence(audio_file):
+    """Try the VAD silence trim; fall back to the original upload.
+
+    Returns ``(upload_source, timestamp_context)`` where the context is the
+    ``(mapping, sample_rate)`` needed to un-warp model timestamps, or None
+    when the original audio is being uploaded unchanged.
+    """
+    if vad is None:
+        return audio_file, None
+    trimmed = vad.trim_silence(audio_file)
+    if trimmed is None:
+        return audio_file, None
+    buf, mapping, sample_rate = trimmed
+    # Dress the buffer up as an upload: the pipeline only needs these three.
+    buf.name = os.path.splitext(audio_file.name)[0] + ".wav"
+    buf.type = "audio/wav"
+    buf.size = buf.getbuffer().nbytes
+    return buf, (mapping, sample_rate)
+
+
+def unwarp_timestamps(result_text, mapping, sample_rate):
+    """Translate segment timestamps from trimmed-audio time back to the recording.
+
+    The model only saw the voiced portions, so its ``start_seconds`` values
+    drift ahead of the real recording by however much silence was cut before
+    each segment. Returns the corrected JSON text; non-JSON output is
+    returned unchanged.
+    """
+    try:
+        data = orjson.loads(result_text.encode("utf-8"))
+    except orjson.JSONDecodeError:
+        return result_text
+    for segment in data.get("transcript_segments", []):
+        start = segment.get("start_seconds")
+        if isinstance(start, (int, float)):
+            orig = vad.unwarp(int(start * sample_rate), mapping)
+            segment["start_seconds"] = round(float(orig) / sample_rate, 1)
+    return orjson.dumps(data).decode("utf-8")
+
+
+def hash_uploaded_file(audio_file):
+    """BLAKE2 digest of the upload, taken in 1 MiB slices.
+
+    Reads through ``getbuffer()`` rather than the shared file pointer so it
+    can run while a background thread is uploading the same file object.
+    """
+    hasher = hashlib.blake2b()
+    buf = audio_file.getbuffer()
+    for start in range(0, len(buf), 1 << 20):
+        hasher.update(buf[start:start + (1 << 20)])
+    return hasher.hexdigest()
+
+
+def _temp_dir(upload_size):
+    """Pick a directory for temp writes, preferring RAM-backed /dev/shm.
+
+    On managed deployments /tmp is often a real (slow) disk; tmpfs makes the
+    write memcpy-speed. Falls back to the tempfile default when /dev/shm is
+    missing, unwritable, or too small to hold the file with 2x headroom.
+    """
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        if shutil.disk_usage(shm).free > upload_size * 2:
+            return shm
+    return None
+
+
+def _discard_upload(upload_future):
+    """Drop a speculative upload whose result turned out to be cached."""
+    try:
+        uploaded, temp_path = upload_future.result()
+        genai.delete_file(uploaded.name)
+        if temp_path:
+            os.remove(temp_path)
+    except Exception:
+        pass
+
+
+@st.cache_resource
+def get_model(api_key, model_name, system_instruction, json_mode):
+    """Configure the API and build the model once per (key, model, prompt).
+
+    Streamlit reruns the whole script on every widget interaction; caching the
+    client object here avoids redoing the configure/auth handshake each time.
+    """
+    genai.configure(api_key=api_key, transport=_TRANSPORT)
+    generation_config = {"response_mime_type": "application/json"} if json_mode else None
+    return genai.GenerativeModel(
+        model_name=model_name,
+        system_instruction=system_instruction,
+        generation_config=generation_config,
+    )
+
+
+# Only transcode formats that are uncompressed or bulky; MP3/OGG uploads are
+# already small enough that a re-encode would cost more than it saves.
+_OPUS_SOURCE_TYPES = {"audio/wav", "audio/x-wav", "audio/m4a", "audio/x-m4a", "audio/mp4"}
+_OPUS_MIN_SIZE = 25 * (1 << 20)
+
+
+def compress_to_opus(audio_file):
+    """Transcode a bulky WAV/M4A upload to 24 kbps mono Opus before sending.
+
+    Speech stays fully intelligible at this bitrate while the byte count
+    drops 50-200x, so the Gemini upload leg shrinks accordingly. Returns the
+    path of the .ogg temp file, or None when the input is small, already
+    compressed, ffmpeg is unavailable, or the transcode fails — callers fall
+    back to uploading the original bytes.
+    """
+    if audio_file.size < _OPUS_MIN_SIZE or audio_file.type not in _OPUS_SOURCE_TYPES:
+        return None
+    if shutil.which("ffmpeg") is None:
+        return None
+
+    audio_file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, dir=_temp_dir(audio_file.size), suffix=f".{audio_file.name.split('.')[-1]}") as src_file:
+        shutil.copyfileobj(audio_file, src_file, length=1 << 20)
+        src_path = src_file.name
+    opus_path = os.path.splitext(src_path)[0] + ".ogg"
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-i", src_path, "-ac", "1", "-ar", "16000",
+             "-c:a", "libopus", "-b:a", "24k", "-vbr", "on", opus_path],
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            if os.path.exists(opus_path):
+                os.remove(opus_path)
+            return None
+        return opus_path
+    finally:
+        os.remove(src_path)
+
+
+@st.cache_resource
+def warmup(api_key, model_name):
+    """Prime the connection with a one-token generation, once per key/model.
+
+    The first real call otherwise pays the TLS handshake, auth refresh and
+    possibly a model cold start. Running this when the key is entered means
+    the connection is warm by the time an upload finishes. Purely
+    opportunistic: failures (bad key, timeout) surface on the real call.
+    """
+    try:
+        genai.configure(api_key=api_key, transport=_TRANSPORT)
+        model = genai.GenerativeModel(model_name=model_name)
+        model.generate_content(
+            "ping",
+            generation_config={"max_output_tokens": 1},
+            request_options={"timeout": 2},
+        )
+    except Exception:
+        pass
+
+
+def upload_to_gemini(audio_file):
+    """Upload the recording to Gemini, straight from the in-memory buffer.
+
+    Returns ``(uploaded_file, temp_path)`` where ``temp_path`` is None unless
+    a temp file was left on disk — either the Opus transcode of a bulky
+    upload, or the fallback copy for SDKs that refuse file-like objects. The
+    caller is responsible for removing it.
+    """
+    opus_path = compress_to_opus(audio_file)
+    if opus_path:
+        uploaded = genai.upload_file(
+            opus_path,
+            mime_type="audio/ogg",
+            display_name=audio_file.name,
+        )
+        return uploaded, opus_path
+
+    audio_file.seek(0)
+    try:
+        uploaded = genai.upload_file(
+            audio_file,
+            mime_type=audio_file.type,
+            display_name=audio_file.name,
+        )
+        return uploaded, None
+    except (TypeError, AttributeError):
+        # Older SDK versions only accept a path; stream to a temp file instead.
+        audio_file.seek(0)
+        with tempfile.NamedTemporaryFile(delete=False, dir=_temp_dir(audio_file.size), suffix=f".{audio_file.name.split('.')[-1]}") as temp_file:
+            shutil.copyfileobj(audio_file, temp_file, length=1 << 20)
+            temp_path = temp_file.name
+        return genai.upload_file(temp_path), temp_path
+
+
+def wait_until_active(uploaded, quiet=False):
+    """Poll an uploaded file until Gemini reports it ACTIVE.
+
+    The SDK's default wait is coarse; start at 50 ms so short clips move on
+    almost immediately and back off exponentially (capped at 2 s) so long
+    uploads don't hammer the API. Raises if server-side processing failed.
+    ``quiet`` suppresses status widgets for callers running off the script
+    thread, where Streamlit calls are not allowed.
+    """
+    wait = 0.05
+    polls = 0
+    while uploaded.state.name == "PROCESSING":
+        time.sleep(wait)
+        wait = min(wait * 1.7, 2.0)
+        polls += 1
+        if not quiet and polls % 5 == 0:
+            st.info("Waiting for Gemini to finish processing the upload...")
+        uploaded = genai.get_file(uploaded.name)
+    if uploaded.state.name == "FAILED":
+        raise RuntimeError(f"Gemini could not process the uploaded audio ({uploaded.name}).")
+    return uploaded
+
+
+# Recordings longer than an hour are split into ~10 minute chunks that are
+# transcribed concurrently; anything smaller goes through the single-call path.
+_SEGMENT_SECONDS = 600
+_LONG_MEETING_SECONDS = 3600
+_LONG_MEETING_MIN_SIZE = 100 * (1 << 20)
+
+
+def _audio_duration(path):
+    """Duration of an audio file in seconds via ffprobe, or None."""
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", path],
+        capture_output=True, text=True,
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def segment_long_audio(audio_file):
+    """Split a very long recording into chunk files for parallel processing.
+
+    Returns the ordered chunk paths, or None for the common single-call case:
+    small uploads, recordings under an hour, missing ffmpeg/ffprobe, or a
+    failed probe/split. The caller removes the chunk directory when done.
+    """
+    if audio_file.size < _LONG_MEETING_MIN_SIZE:
+        return None
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        return None
+
+    audio_file.seek(0)
+    suffix = f".{audio_file.name.split('.')[-1]}"
+    with tempfile.NamedTemporaryFile(delete=False, dir=_temp_dir(audio_file.size), suffix=suffix) as src_file:
+        shutil.copyfileobj(audio_file, src_file, length=1 << 20)
+        src_path = src_file.name
+    try:
+        duration = _audio_duration(src_path)
+        if not duration or duration < _LONG_MEETING_SECONDS:
+            return None
+        chunk_dir = tempfile.mkdtemp(dir=_temp_dir(audio_file.size))
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-i", src_path, "-f", "segment",
+             "-segment_time", str(_SEGMENT_SECONDS), "-c", "copy",
+             os.path.join(chunk_dir, f"chunk%03d{suffix}")],
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+            return None
+        chunks = sorted(
+            os.path.join(chunk_dir, name) for name in os.listdir(chunk_dir)
+        )
+        return chunks or None
+    finally:
+        os.remove(src_path)
+
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=64)
+def analyze_chunks_cached(audio_hash, model_name, prompt_hash, json_mode,
+                          _api_key, _chunk_paths, _system_instruction,
+                          _user_prompt):
+    """Transcribe pre-split chunks concurrently and stitch the results.
+
+    Each chunk gets its own upload + generate_content_async call; the calls
+    are network-bound and embarrassingly parallel, so wall time approaches
+    the slowest chunk instead of the sum. A final model pass merges the
+    per-chunk outputs into one document. Cached with the same key scheme as
+    ``analyze_cached``.
+    """
+    model = get_model(_api_key, model_name, _system_instruction, json_mode)
+
+    async def process_chunk(path):
+        uploaded = await asyncio.to_thread(genai.upload_file, path)
+        try:
+            uploaded = await asyncio.to_thread(wait_until_active, uploaded, True)
+            response = await model.generate_content_async([_user_prompt, uploaded])
+            return response.text
+        finally:
+            _io_pool.submit(genai.delete_file, uploaded.name)
+
+    async def gather_chunks():
+        return await asyncio.gather(*(process_chunk(p) for p in _chunk_paths))
+
+    partials = asyncio.run(gather_chunks())
+    if len(partials) == 1:
+        return partials[0]
+
+    segments = [f"SEGMENT {i + 1}:\n{text}" for i, text in enumerate(partials)]
+    response = model.generate_content([STITCH_PROMPT] + segments)
+    return response.text
+
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=64)
+def analyze_cached(audio_hash, model_name, prompt_hash, json_mode,
+                   _api_key, _upload_future, _placeholder,
+                   _system_instruction, _user_prompt):
+    """Run the upload + generate pipeline, memoized on content and prompts.
+
+    Keyed on the audio digest, model, prompt hash and output mode so
+    re-analysing the same clip skips the whole Gemini round trip. The leading
+    underscores tell Streamlit not to hash the API key, the in-flight upload
+    future, the output placeholder or the prompt text (the prompt hash covers
+    it). In text modes, tokens are rendered into ``_placeholder`` as they
+    stream in, so the first lines appear long before generation finishes.
+    """
+    # Mark the future as used so the caller knows this was a cache miss and
+    # the uploaded file must not be discarded behind our back.
+    _upload_future.consumed = True
+    model = get_model(_api_key, model_name, _system_instruction, json_mode)
+    uploaded_gemini_file, temp_path = _upload_future.result()
+    try:
+        uploaded_gemini_file = wait_until_active(uploaded_gemini_file)
+        stream = model.generate_content(
+            [_user_prompt, uploaded_gemini_file], stream=True
+        )
+        buf = ""
+        for chunk in stream:
+            buf += chunk.text
+            if not json_mode:
+                _placeholder.markdown(buf)
+    finally:
+        # Fire-and-forget: rendering should not wait on the delete round trip.
+        _io_pool.submit(genai.delete_file, uploaded_gemini_file.name)
+        if temp_path:
+            _io_pool.submit(os.remove, temp_path)
+    return buf
 
 # 2. Simplified Human-Readable Prompts
 SYSTEM_INSTRUCTION = """
@@ -70,6 +449,223 @@ Provide the full conversation formatted exactly like this:
 *(English Translation: [translation])* <-- ONLY include this line if the original text was non-English. Leave a blank line after every turn.
 """
 
+BASIC_SYSTEM_INSTRUCTION = """
+You are a meeting transcription assistant.
+
+Process the uploaded meeting audio and return a short plain-text document.
+Keep formatting minimal: short paragraphs and simple dash lists, no tables,
+no JSON. If spoken text is not in English, add an English translation in
+parentheses right after it.
+"""
+
+BASIC_USER_PROMPT = """
+For the uploaded meeting recording, provide:
+1. A short summary of the meeting.
+2. The action items, one per line.
+3. The full transcript with consistent speaker labels.
+"""
+
+JSON_SYSTEM_INSTRUCTION = """
+You are an expert multilingual meeting transcription and notes assistant.
+
+Process the uploaded meeting audio and return ONE JSON object and nothing
+else (no markdown, no code fences) with exactly this shape:
+
+{
+  "meeting_metadata": {
+    "title": "short descriptive title",
+    "languages": ["languages spoken"],
+    "participants": ["speaker labels or names"]
+  },
+  "meeting_note": {
+    "executive_summary_bullets": ["..."],
+    "key_discussion_topics": ["..."],
+    "decisions_made": ["..."],
+    "action_items": [{"owner": "who", "task": "what"}],
+    "risks_or_blockers": ["..."]
+  },
+  "transcript_segments": [
+    {
+      "speaker": "Speaker 1",
+      "text": "verbatim spoken text",
+      "english_translation": "translation, or null if already English",
+      "start_seconds": 0
+    }
+  ],
+  "transcript_plaintext": "the full transcript as readable plain text"
+}
+
+Keep speaker labels consistent. start_seconds is the approximate offset of
+the segment from the start of the recording.
+"""
+
+JSON_USER_PROMPT = """
+Process the uploaded meeting recording and return the JSON document described
+in the system instruction.
+"""
+
+STITCH_PROMPT = """
+The following segments are partial outputs produced from consecutive ~10
+minute pieces of ONE meeting recording, in order. Merge them into a single
+document in exactly the same format as the segments, keeping speaker labels
+consistent across segment boundaries, removing duplicated boundary content,
+and combining the summary sections so the result reads as one meeting.
+"""
+
+
+# Compiled once at import to straight-line Python. One validation pass lets
+# the dashboard index the payload directly instead of chaining defensive
+# .get() fallbacks, and flags malformed responses with a precise message.
+VALIDATE_RESPONSE = fastjsonschema.compile({
+    "type": "object",
+    "properties": {
+        "meeting_metadata": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string"},
+                "languages": {"type": "array", "items": {"type": "string"}},
+                "participants": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["title", "languages", "participants"],
+        },
+        "meeting_note": {
+            "type": "object",
+            "properties": {
+                "executive_summary_bullets": {"type": "array"},
+                "key_discussion_topics": {"type": "array"},
+                "decisions_made": {"type": "array"},
+                "action_items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "owner": {"type": "string"},
+                            "task": {"type": "string"},
+                        },
+                        "required": ["owner", "task"],
+                    },
+                },
+                "risks_or_blockers": {"type": "array"},
+            },
+            "required": ["executive_summary_bullets", "key_discussion_topics",
+                         "decisions_made", "action_items", "risks_or_blockers"],
+        },
+        "transcript_segments": {"type": "array"},
+        "transcript_plaintext": {"type": "string"},
+    },
+    "required": ["meeting_metadata", "meeting_note", "transcript_segments",
+                 "transcript_plaintext"],
+})
+
+
+def render_json(result_text):
+    """Raw structured output, pretty-printed in an interactive JSON viewer."""
+    try:
+        st.json(orjson.loads(result_text.encode("utf-8")))
+    except orjson.JSONDecodeError:
+        st.error("The model returned malformed JSON; showing raw output.")
+        st.code(result_text, language="json")
+
+
+def render_dashboard(result_text):
+    """Structured output as a metrics dashboard plus a transcript tab."""
+    try:
+        data = orjson.loads(result_text.encode("utf-8"))
+        VALIDATE_RESPONSE(data)
+    except orjson.JSONDecodeError:
+        st.error("The model returned malformed JSON; showing raw output.")
+        st.code(result_text, language="json")
+        return
+    except fastjsonschema.JsonSchemaException as e:
+        st.error(f"The model's JSON did not match the expected shape ({e}); showing raw output.")
+        st.code(result_text, language="json")
+        return
+
+    # Validated above, so the payload can be indexed directly from here on.
+    meta = data["meeting_metadata"]
+    notes = data["meeting_note"]
+
+    tab1, tab2 = st.tabs(["📊 Dashboard", "📜 Transcript"])
+
+    with tab1:
+        st.subheader(meta["title"])
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Languages", ", ".join(meta["languages"]) or "Unknown")
+        col2.metric("Participants", len(meta["participants"]))
+        col3.metric("Segments", len(data["transcript_segments"]))
+
+        # Each section is rendered as one joined string -> one widget call,
+        # not one websocket round trip per bullet.
+        st.markdown("#### Executive Summary\n" + "\n".join(
+            f"- {bullet}" for bullet in notes["executive_summary_bullets"]
+        ))
+        st.markdown("#### Action Items\n" + "\n\n".join(
+            f"- **{item['owner']}**: {item['task']}"
+            for item in notes["action_items"]
+        ))
+        with st.expander("Decisions, Risks & Topics"):
+            st.markdown("**Decisions Made**\n" + "\n".join(
+                f"- {decision}" for decision in notes["decisions_made"]
+            ))
+            st.markdown("**Risks / Blockers**\n" + "\n".join(
+                f"- {risk}" for risk in notes["risks_or_blockers"]
+            ))
+            st.markdown("**Key Discussion Topics**\n" + "\n".join(
+                f"- {topic}" for topic in notes["key_discussion_topics"]
+            ))
+
+    with tab2:
+        transcript = data["transcript_plaintext"]
+        # st.code would run the syntax highlighter over the whole transcript
+        # (one DOM node per line); a text area is a single element.
+        st.text_area(
+            "Transcript", transcript, height=600, label_visibility="collapsed"
+        )
+        st.download_button(
+            "Download .txt", transcript, file_name="transcript.txt"
+        )
+
+
+# One shared pipeline; each mode only supplies its prompts and a render path.
+MODES = {
+    "Basic": {
+        "system": BASIC_SYSTEM_INSTRUCTION,
+        "user": BASIC_USER_PROMPT,
+        "json_mode": False,
+        "render": st.markdown,
+    },
+    "JSON": {
+        "system": JSON_SYSTEM_INSTRUCTION,
+        "user": JSON_USER_PROMPT,
+        "json_mode": True,
+        "render": render_json,
+    },
+    "Dashboard": {
+        "system": JSON_SYSTEM_INSTRUCTION,
+        "user": JSON_USER_PROMPT,
+        "json_mode": True,
+        "render": render_dashboard,
+    },
+    "Markdown": {
+        "system": SYSTEM_INSTRUCTION,
+        "user": USER_PROMPT,
+        "json_mode": False,
+        "render": st.markdown,
+    },
+}
+
+# Prompt digests are computed once at import time; the prompts never change
+# within a process, so hashing the multi-KB strings on every click was waste.
+for _mode in MODES.values():
+    _mode["prompt_hash"] = hashlib.blake2b(
+        (_mode["system"] + _mode["user"]).encode()
+    ).hexdigest()[:16]
+
+if api_key:
+    # Warm the endpoint while the user is still picking a file; cached, so
+    # it only ever runs once per (key, model).
+    warmup(api_key, selected_model)
+
 # 3. Execution Logic
 if st.button("Process Audio", type="primary"):
     if not api_key:
@@ -78,35 +674,58 @@ if st.button("Process Audio", type="primary"):
         st.warning("Please upload an audio file first.")
     else:
         try:
-            genai.configure(api_key=api_key)
-            
-            with st.spinner(f"Analyzing with {selected_model}..."):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{audio_file.name.split('.')[-1]}") as temp_file:
-                    temp_file.write(audio_file.read())
-                    temp_path = temp_file.name
+            mode = MODES[output_mode]
 
+            with st.spinner(f"Analyzing with {selected_model}..."):
                 st.info("Uploading audio file securely...")
-                uploaded_gemini_file = genai.upload_file(temp_path)
-                
-                # Standard configuration without the JSON restriction
-                model = genai.GenerativeModel(
-                    model_name=selected_model,
-                    system_instruction=SYSTEM_INSTRUCTION
-                )
-                
-                st.info("Generating formatted summary and transcript...")
-                response = model.generate_content([USER_PROMPT, uploaded_gemini_file])
-                
-                genai.delete_file(uploaded_gemini_file.name)
-                os.remove(temp_path)
-                
+                chunk_paths = segment_long_audio(audio_file)
+
+                output = st.empty()
+
+                if chunk_paths:
+                    # Hour-plus recording: transcribe ~10 min chunks in
+                    # parallel and stitch, instead of one huge blocking call.
+                    audio_hash = hash_uploaded_file(audio_file)
+                    result_text = analyze_chunks_cached(
+                        audio_hash, selected_model, mode["prompt_hash"],
+                        mode["json_mode"], api_key, chunk_paths,
+                        mode["system"], mode["user"]
+                    )
+                    _io_pool.submit(
+                        shutil.rmtree, os.path.dirname(chunk_paths[0]),
+                        ignore_errors=True,
+                    )
+                else:
+                    # Cut silence locally first: fewer bytes uploaded, fewer
+                    # input tokens billed. Falls through untouched when the
+                    # VAD stack is unavailable or there is little to trim.
+                    upload_source, timestamp_context = filter_silence(audio_file)
+
+                    # Start the network upload in the background and hash the
+                    # same buffer on this thread while it is in flight.
+                    upload_future = _io_pool.submit(upload_to_gemini, upload_source)
+                    audio_hash = hash_uploaded_file(upload_source)
+
+                    # Cache hit: same clip, model and prompts -> no round trip.
+                    result_text = analyze_cached(
+                        audio_hash, selected_model, mode["prompt_hash"],
+                        mode["json_mode"], api_key, upload_future, output,
+                        mode["system"], mode["user"]
+                    )
+                    if not getattr(upload_future, "consumed", False):
+                        upload_future.add_done_callback(_discard_upload)
+
+                    if timestamp_context and mode["json_mode"]:
+                        result_text = unwarp_timestamps(result_text, *timestamp_context)
+
                 st.success("Processing Complete!")
-                
+
                 # --- DISPLAY OUTPUT ---
-                
-                # 1. Render for easy reading
-                st.markdown(response.text)
-                
+
+                # Final render; replaces the streaming placeholder.
+                output.empty()
+                mode["render"](result_text)
+
                 st.divider()
 
         except Exception as e: